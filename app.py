@@ -1,3 +1,4 @@
+import hashlib
 import streamlit as st
 import smtplib
 from email.mime.multipart import MIMEMultipart
@@ -8,13 +9,19 @@ from fpdf import FPDF
 
 
 try:
-    from backend.main import ResumeData, generate_resume, get_skill_suggestions
+    from backend.main import ResumeData, generate_resume, get_skill_suggestions, resume_data_from_text
     from backend.config import settings
     from backend.rag import rag_service
+    from backend.corpus_index import corpus_index
+    from backend.skill_suggester import skill_suggester
+    from backend.artifact_store import artifact_store
 except ImportError:
-    from backend.main import ResumeData, generate_resume, get_skill_suggestions
+    from backend.main import ResumeData, generate_resume, get_skill_suggestions, resume_data_from_text
     from backend.config import settings
     from backend.rag import rag_service
+    from backend.corpus_index import corpus_index
+    from backend.skill_suggester import skill_suggester
+    from backend.artifact_store import artifact_store
 
 def create_pdf_safe(text):
     pdf = FPDF()
@@ -31,6 +38,36 @@ def create_pdf_safe(text):
         pdf.multi_cell(effective_page_width, 5, safe)
     return bytes(pdf.output())
 
+def store_session_artifact(state_key, data, suffix):
+    """Keep only the content hash of an artifact in session state."""
+    previous = st.session_state.get(state_key)
+    st.session_state[state_key] = artifact_store.put(data, suffix)
+    artifact_store.release(previous)
+    return st.session_state[state_key]
+
+def store_resume_pdf(state_key, text):
+    """Render the PDF for resume text, reusing the stored one if the text is unchanged."""
+    source_key = f"{state_key}_source"
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    if st.session_state.get(source_key) == text_hash and st.session_state.get(state_key) in artifact_store:
+        return st.session_state[state_key]
+    pdf_hash = store_session_artifact(state_key, create_pdf_safe(text), ".pdf")
+    st.session_state[source_key] = text_hash
+    return pdf_hash
+
+def artifact_download(label, key, filename, mime="application/pdf"):
+    """Download button for a stored artifact, read from disk on each render.
+
+    Streamlit's media file manager still keeps one copy of the file while it
+    is shown; only the long-lived copy in session state is avoided.
+    """
+    pdf_file = artifact_store.open(key)
+    if pdf_file is None:
+        st.warning("⚠️ Resume has expired. Please generate it again")
+        return
+    with pdf_file:
+        st.download_button(label, pdf_file, file_name=filename, mime=mime, use_container_width=True)
+
 def send_email(recipient, pdf_data, filename, name):
     msg = MIMEMultipart()
     msg['From'] = settings.SENDER_EMAIL
@@ -87,7 +124,8 @@ with col_search:
 
 # Search and display suggestions
 if search_query and search_query != st.session_state.last_search_query:
-st.session_state.skill_suggestions_data = get_skill_suggestions(search_query)
+    with st.spinner("Finding skills..."):
+        st.session_state.skill_suggestions_data = get_skill_suggestions(search_query)
         st.session_state.last_search_query = search_query
 
 if not search_query:
@@ -97,7 +135,10 @@ if not search_query:
 result = st.session_state.skill_suggestions_data or {}
 if search_query and result:
     if result.get("skills"):
-        st.success("💡 **AI-Generated Skills:**")
+        if result.get("source") == "local":
+            st.success("💡 **Suggested Skills:**")
+        else:
+            st.success("💡 **AI-Generated Skills:**")
 
         # Display skills in a nice format
         col1, col2 = st.columns([3, 1])
@@ -117,11 +158,14 @@ if search_query and result:
             )
     else:
         st.error(result.get("text", "Could not generate suggestions"))
+    
+    suggestion_stats = skill_suggester.stats()
+    st.caption(f"⚡ {suggestion_stats['local_ratio']:.0%} of {suggestion_stats['queries']} skill searches answered without an LLM call")
 
 st.divider()
 
 # Feature Selection
-tab1, tab2, tab3 = st.tabs(["📝 Build Resume", "🎯 ATS Checker", "⚡ Quick Optimize"])
+tab1, tab2, tab3, tab4 = st.tabs(["📝 Build Resume", "🎯 ATS Checker", "⚡ Quick Optimize", "🏆 Top Candidates"])
 
 # Feature 1: Standard Resume Builder (NO JD FIELD)
 with tab1:
@@ -190,31 +234,29 @@ with tab1:
                     
                     with st.spinner("Generating your professional resume..."):
                         resume_text = generate_resume(data, jd=None)
-                        pdf_output = create_pdf_safe(resume_text)
-                        st.session_state.resume_pdf = pdf_output
+                        corpus_index.add(resume_text, metadata={"name": name, "source": "generated"})
+                        pdf_hash = store_resume_pdf("resume_pdf_hash", resume_text)
                         st.session_state.resume_filename = f"{name.replace(' ', '_')}_resume.pdf"
                         st.success("✅ Resume generated successfully!")
-                        st.download_button(
-                            "📥 Download Resume", 
-                            pdf_output, 
-                            file_name=st.session_state.resume_filename, 
-                            mime="application/pdf",
-                            use_container_width=True
-                        )
+                        artifact_download("📥 Download Resume", pdf_hash, st.session_state.resume_filename)
                 except ValueError as e:
                     st.error(f"❌ Validation Error: {str(e)}")
                 except Exception as e:
                     st.error(f"❌ Error: {str(e)}")
     
     with col2:
-        if 'resume_pdf' in st.session_state:
+        if 'resume_pdf_hash' in st.session_state:
             st.write("**📧 Email Your Resume**")
             recipient = st.text_input("Recipient Email:", key="f1_recipient", placeholder="recruiter@company.com")
             if st.button("📨 Send Email", use_container_width=True):
                 if recipient:
                     try:
-                        send_email(recipient, st.session_state.resume_pdf, st.session_state.resume_filename, name)
-                        st.success(f"✅ Resume sent to {recipient}!")
+                        pdf_data = artifact_store.read(st.session_state.resume_pdf_hash)
+                        if pdf_data is None:
+                            st.warning("⚠️ Resume has expired. Please generate it again")
+                        else:
+                            send_email(recipient, pdf_data, st.session_state.resume_filename, name)
+                            st.success(f"✅ Resume sent to {recipient}!")
                     except Exception as e:
                         st.error(f"❌ Email Error: {str(e)}")
                 else:
@@ -230,6 +272,7 @@ with tab2:
         if resume_text:
             with st.spinner("Analyzing..."):
                 score = rag_service.calculate_ats_score(resume_text, jd_text if jd_text else None)
+                corpus_index.add(resume_text, metadata={"name": resume_text.split('\n')[0][:80], "source": "uploaded"})
                 suggestions = rag_service.get_ats_suggestions(resume_text)
                 
                 col1, col2 = st.columns([1, 2])
@@ -259,25 +302,23 @@ with tab3:
         if existing_resume and target_jd:
             try:
                 with st.spinner("Optimizing with RAG..."):
-                    # Extract basic info (simplified)
-                    lines = existing_resume.split('\n')
-                    name = lines[0] if lines else "Candidate"
-                    
                     # Get RAG-enhanced suggestions
                     relevant_context = rag_service.get_relevant_skills(target_jd)
                     
-                    # Create optimized resume
-                    data = ResumeData(
-                        name=name, email="email@example.com", phone="1234567890",
-                        summary=existing_resume[:200], skills=relevant_context[:200],
-                        experience=existing_resume, education="See resume"
-                    )
+                    # Split the pasted resume so each section is rewritten from its own
+                    # content; anything missing or invalid keeps the old placeholder
+                    data = resume_data_from_text(existing_resume, {
+                        "name": "Candidate", "email": "email@example.com", "phone": "1234567890",
+                        "summary": existing_resume[:200], "skills": relevant_context[:200],
+                        "experience": existing_resume, "education": "See resume",
+                    })
+                    name = data.name
                     optimized_text = generate_resume(data, jd=target_jd)
-                    pdf_output = create_pdf_safe(optimized_text)
+                    corpus_index.add(optimized_text, metadata={"name": name, "source": "optimized"})
+                    pdf_hash = store_resume_pdf("optimized_pdf_hash", optimized_text)
                     
                     st.success("✅ Optimized!")
-                    st.download_button("📥 Download Optimized Resume", pdf_output, 
-                                     file_name="optimized_resume.pdf", mime="application/pdf")
+                    artifact_download("📥 Download Optimized Resume", pdf_hash, "optimized_resume.pdf")
                     
                     with st.expander("👁️ Preview"):
                         st.text(optimized_text[:500] + "...")
@@ -285,3 +326,22 @@ with tab3:
                 st.error(f"❌ {str(e)}")
         else:
             st.error("❌ Provide both resume and JD")
+
+# Feature 4: Rank stored resumes against a Job Description
+with tab4:
+    st.subheader("Find the Best-Matching Resumes for a Job Description")
+    st.caption(f"📚 {len(corpus_index)} resumes indexed")
+    rank_jd = st.text_area("Paste Job Description*", height=150, key="f4_jd")
+    top_k = st.number_input("Number of candidates", min_value=1, max_value=500, value=50, key="f4_k")
+    
+    if st.button("🏆 Rank Candidates", type="primary", use_container_width=True):
+        if rank_jd:
+            matches = corpus_index.top_k(rank_jd, k=int(top_k))
+            if matches:
+                for rank, match in enumerate(matches, 1):
+                    name = match["metadata"].get("name") or match["id"]
+                    st.write(f"**{rank}. {name}** — ATS {match['score']}/100 ({match['matched_terms']} JD keywords)")
+            else:
+                st.info("No resumes indexed yet")
+        else:
+            st.error("❌ Provide a Job Description")
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import threading
+import time
+from typing import BinaryIO, Dict, Optional
+
+
+class ArtifactStore:
+    """Content-addressed on-disk store for generated PDFs.
+
+    Each artifact is written once under the SHA-256 of its content, so
+    sessions only need to keep the hash. Sessions take and release
+    references; unreferenced artifacts are evicted first when the store
+    grows past `max_bytes`, and anything untouched for `max_age_seconds`
+    is evicted regardless, which covers sessions that never come back.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 512 * 1024 * 1024, max_age_seconds: int = 24 * 3600):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        self._loaded = False
+        # hash -> {"path": str, "size": int, "refs": int, "accessed": float}
+        self._entries: Dict[str, dict] = {}
+        self._total_bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        self.initialize()
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def initialize(self) -> bool:
+        """Pick up artifacts left on disk by a previous run"""
+        if self._loaded:
+            return True
+        with self._lock:
+            if self._loaded:
+                return True
+            os.makedirs(self.root, exist_ok=True)
+            for dirpath, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    if filename.endswith(".tmp"):
+                        continue
+                    path = os.path.join(dirpath, filename)
+                    key = os.path.splitext(filename)[0]
+                    stat = os.stat(path)
+                    self._entries[key] = {"path": path, "size": stat.st_size, "refs": 0, "accessed": stat.st_mtime}
+                    self._total_bytes += stat.st_size
+            self._loaded = True
+        return True
+
+    def put(self, data: bytes, suffix: str = ".bin") -> str:
+        """Store data once and return its content hash, taking a reference"""
+        self.initialize()
+        key = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                path = os.path.join(self.root, key[:2], f"{key}{suffix}")
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                entry = {"path": path, "size": len(data), "refs": 0, "accessed": time.time()}
+                self._entries[key] = entry
+                self._total_bytes += len(data)
+            entry["refs"] += 1
+            entry["accessed"] = time.time()
+            self.evict()
+        return key
+
+    def release(self, key: Optional[str]) -> None:
+        """Drop a reference; the artifact becomes evictable at zero"""
+        if not key:
+            return
+        self.initialize()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry["refs"] > 0:
+                entry["refs"] -= 1
+
+    def path(self, key: Optional[str]) -> Optional[str]:
+        """On-disk path of an artifact, or None if it was evicted"""
+        entry = self._touch(key)
+        if entry is None:
+            return None
+        if not os.path.exists(entry["path"]):
+            self._forget(key)
+            return None
+        return entry["path"]
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Open an artifact for streaming, or None if it was evicted"""
+        entry = self._touch(key)
+        if entry is None:
+            return None
+        try:
+            return open(entry["path"], "rb")
+        except FileNotFoundError:
+            self._forget(key)
+            return None
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Read a whole artifact, for consumers that need bytes"""
+        f = self.open(key)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def evict(self) -> int:
+        """Apply age- and size-based eviction, returning artifacts removed"""
+        self.initialize()
+        removed = 0
+        with self._lock:
+            cutoff = time.time() - self.max_age_seconds
+            for key in [k for k, e in self._entries.items() if e["accessed"] < cutoff]:
+                self._remove(key)
+                removed += 1
+
+            if self._total_bytes > self.max_bytes:
+                idle = sorted(
+                    (e["accessed"], k) for k, e in self._entries.items() if e["refs"] == 0
+                )
+                for _, key in idle:
+                    if self._total_bytes <= self.max_bytes:
+                        break
+                    self._remove(key)
+                    removed += 1
+        return removed
+
+    def _touch(self, key: Optional[str]) -> Optional[dict]:
+        if not key:
+            return None
+        self.initialize()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                entry["accessed"] = time.time()
+            return entry
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry:
+                self._total_bytes -= entry["size"]
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        try:
+            os.remove(entry["path"])
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Windows refuses to delete files that are still open
+            print(f"⚠️  Could not evict artifact {key[:12]}: {e}")
+            return
+        self._forget(key)
+
+
+def _default_store_settings() -> dict:
+    try:
+        from backend.config import settings
+        return {
+            "root": settings.ARTIFACT_DIR,
+            "max_bytes": settings.ARTIFACT_MAX_BYTES,
+            "max_age_seconds": settings.ARTIFACT_MAX_AGE_SECONDS,
+        }
+    except Exception:
+        return {"root": "data/artifacts"}
+
+
+artifact_store = ArtifactStore(**_default_store_settings())
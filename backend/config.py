@@ -9,6 +9,11 @@ class Settings(BaseSettings):
     SMTP_PORT: int = 587
     SENDER_EMAIL: str = ""
     SENDER_PASSWORD: str = ""
+    CORPUS_INDEX_PATH: str = "data/resume_index.jsonl"
+    SKILL_MODEL_PATH: str = "data/skill_model.jsonl"
+    ARTIFACT_DIR: str = "data/artifacts"
+    ARTIFACT_MAX_BYTES: int = 512 * 1024 * 1024
+    ARTIFACT_MAX_AGE_SECONDS: int = 24 * 3600
     
     model_config = SettingsConfigDict(
         env_file=".env", 
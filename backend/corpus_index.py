@@ -0,0 +1,417 @@
+import hashlib
+import heapq
+import json
+import os
+import threading
+from array import array
+from collections import Counter
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, List, Optional, Set
+
+from backend.rag import ats_terms, ats_tokenize, rag_service
+
+
+class CorpusIndex:
+    """Persistent inverted index over stored resumes for top-k JD matching.
+
+    Every add/delete is appended to a JSONL journal, so updates never rewrite
+    the whole index; `compact()` drops superseded records when the journal
+    grows too large. Ranking uses the same tokenization and scoring as
+    `RAGService.calculate_ats_score`.
+
+    Postings are kept per base ATS score, so queries walk score buckets from
+    high to low and stop once the JD bonus (at most 10) can no longer lift a
+    bucket past the current k-th result. Terms found in most resumes ("and",
+    "the", ...) are stored as the resumes *lacking* them, which keeps them
+    cheap to count without changing the score.
+    """
+
+    COMPACT_MIN_RECORDS = 1000
+    COMMON_TERM_MIN_DOCS = 1000
+    COMMON_TERM_RATIO = 0.6
+    RARE_TERM_RATIO = 0.4
+    PURGE_MIN_DEAD = 1000
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._load_failed = False
+        # doc id -> internal doc number
+        self._docs: Dict[str, int] = {}
+        # per doc number; a base score of 0 marks a deleted document
+        self._ids: List[Optional[str]] = []
+        self._metadata: List[Optional[dict]] = []
+        self._base_scores = array("B")
+        self._lengths = array("I")
+        self._unique_terms = array("I")
+        # base score -> term -> doc numbers containing it
+        self._postings: Dict[int, Dict[str, array]] = {}
+        # base score -> common term -> doc numbers lacking it
+        self._complements: Dict[int, Dict[str, array]] = {}
+        self._common_terms: Set[str] = set()
+        # term -> documents containing it, deleted ones included until purge
+        self._df: Dict[str, int] = {}
+        # base score -> live doc numbers with that score
+        self._by_base_score: Dict[int, Set[int]] = {}
+        self._dead = 0
+        self._journal_records = 0
+
+    def __len__(self) -> int:
+        self.initialize()
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        self.initialize()
+        return doc_id in self._docs
+
+    def initialize(self) -> bool:
+        """Load the journal from disk once"""
+        if self._loaded:
+            return True
+        with self._lock:
+            if self._loaded:
+                return True
+            if self.path and os.path.exists(self.path):
+                try:
+                    self._replay_journal()
+                except Exception as e:
+                    # Compacting a partial index would drop the unread records
+                    self._load_failed = True
+                    print(f"⚠️  Corpus index load failed: {e}")
+            self._loaded = True
+        return True
+
+    def add(self, text: str, doc_id: Optional[str] = None, metadata: Optional[dict] = None) -> str:
+        """Index a resume and return its id (content hash unless given)"""
+        self.initialize()
+        doc_id = doc_id or hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        tokens = ats_terms(text)
+        record = {
+            "op": "add",
+            "id": doc_id,
+            "terms": sorted(set(tokens)),
+            "length": len(tokens),
+            "base_score": rag_service.calculate_base_score(text),
+            "metadata": metadata or {},
+        }
+        with self._lock:
+            self._apply(record)
+            self._append(record)
+        return doc_id
+
+    def delete(self, doc_id: str) -> bool:
+        """Remove a resume from the index"""
+        self.initialize()
+        with self._lock:
+            if doc_id not in self._docs:
+                return False
+            record = {"op": "delete", "id": doc_id}
+            self._apply(record)
+            self._append(record)
+        return True
+
+    def get(self, doc_id: str) -> Optional[dict]:
+        """Term statistics and metadata of a stored resume"""
+        self.initialize()
+        docno = self._docs.get(doc_id)
+        if docno is None:
+            return None
+        return {
+            "length": self._lengths[docno],
+            "unique_terms": self._unique_terms[docno],
+            "base_score": self._base_scores[docno],
+            "metadata": self._metadata[docno],
+        }
+
+    def top_k(self, jd: str, k: int = 50) -> List[dict]:
+        """Return the k best-matching resumes for a JD, best first"""
+        self.initialize()
+        if k <= 0:
+            return []
+        jd_terms = ats_tokenize(jd)
+        total_terms = len(jd_terms)
+        bonus = rag_service.calculate_match_bonus
+        with self._lock:
+            common = [term for term in jd_terms if term in self._common_terms]
+            rare = [term for term in jd_terms if term in self._df and term not in self._common_terms]
+            max_bonus = bonus(len(common) + len(rare), total_terms)
+            # min-heap of (score, -docno, matched) holding the best k so far
+            best: list = []
+
+            def push(score: int, docno: int, matched: int) -> None:
+                item = (score, -docno, matched)
+                if len(best) < k:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+
+            for base_score in sorted(self._by_base_score, reverse=True):
+                if len(best) >= k and min(100, base_score + max_bonus) <= best[0][0]:
+                    break
+                live = self._by_base_score[base_score]
+                postings = self._postings.get(base_score, {})
+                rare_postings = [postings[term] for term in rare if term in postings]
+                if len(best) >= k:
+                    bucket_bonus = bonus(len(common) + len(rare_postings), total_terms)
+                    if min(100, base_score + bucket_bonus) <= best[0][0]:
+                        continue
+
+                # Every document starts with all common terms matched, then
+                # rare-term hits add and common-term misses subtract
+                hits = Counter()
+                for docnos in rare_postings:
+                    hits.update(docnos)
+                misses = Counter()
+                complements = self._complements.get(base_score, {})
+                for term in common:
+                    docnos = complements.get(term)
+                    if docnos:
+                        misses.update(docnos)
+
+                # Walk documents by rare-term hits, best first. Misses only lower
+                # the count, so stop once hits alone can't beat this bucket's k-th
+                top: list = []
+
+                def keep(net: int, docno: int) -> None:
+                    item = (net, -docno)
+                    if len(top) < k:
+                        heapq.heappush(top, item)
+                    elif item > top[0]:
+                        heapq.heapreplace(top, item)
+
+                for docno, hit_count in sorted(hits.items(), key=itemgetter(1), reverse=True):
+                    if len(top) >= k and hit_count <= top[0][0]:
+                        break
+                    if docno in live:
+                        keep(hit_count - misses.get(docno, 0), docno)
+                # Untouched documents net 0 and miss-only documents less
+                if len(top) < k or top[0][0] < 0:
+                    for docno in islice((d for d in live if d not in hits and d not in misses), k):
+                        keep(0, docno)
+                if len(top) < k or top[0][0] < 0:
+                    for docno, miss_count in misses.items():
+                        if docno in live and docno not in hits:
+                            keep(-miss_count, docno)
+
+                for net, neg_docno in top:
+                    docno = -neg_docno
+                    count = len(common) + net
+                    push(min(100, base_score + bonus(count, total_terms)), docno, count)
+
+            return [
+                {
+                    "id": self._ids[-neg_docno],
+                    "score": score,
+                    "matched_terms": matched,
+                    "metadata": self._metadata[-neg_docno],
+                }
+                for score, neg_docno, matched in sorted(best, reverse=True)
+            ]
+
+    def compact(self) -> None:
+        """Rewrite the journal with only the records of live documents"""
+        if not self.path or self._load_failed or not os.path.exists(self.path):
+            return
+        with self._lock:
+            # Term lists are not kept in memory, so stream them from the journal
+            last_add = {}
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line_no, line in enumerate(f):
+                    record = self._parse_record(line)
+                    if record and record["op"] == "add" and record["id"] in self._docs:
+                        last_add[record["id"]] = line_no
+            keep = set(last_add.values())
+
+            tmp_path = f"{self.path}.tmp"
+            with open(self.path, "r", encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as dst:
+                for line_no, line in enumerate(src):
+                    if line_no in keep:
+                        dst.write(line if line.endswith("\n") else line + "\n")
+            os.replace(tmp_path, self.path)
+            self._journal_records = len(keep)
+
+    def _apply(self, record: dict) -> None:
+        doc_id = record["id"]
+        self._remove(doc_id)
+        if record["op"] == "add":
+            self._insert(doc_id, record)
+        if self._dead > max(self.PURGE_MIN_DEAD, len(self._docs)):
+            self._purge()
+
+    def _insert(self, doc_id: str, record: dict) -> None:
+        terms = set(record["terms"])
+        base_score = record["base_score"]
+        docno = len(self._ids)
+        self._docs[doc_id] = docno
+        self._ids.append(doc_id)
+        self._metadata.append(record.get("metadata") or {})
+        self._base_scores.append(base_score)
+        self._lengths.append(record["length"])
+        self._unique_terms.append(len(terms))
+        self._by_base_score.setdefault(base_score, set()).add(docno)
+
+        postings = self._postings.setdefault(base_score, {})
+        for term in terms:
+            self._df[term] = self._df.get(term, 0) + 1
+            if term in self._common_terms:
+                continue
+            docnos = postings.get(term)
+            if docnos is None:
+                postings[term] = docnos = array("I")
+            docnos.append(docno)
+
+        if self._common_terms:
+            complements = self._complements.setdefault(base_score, {})
+            for term in self._common_terms - terms:
+                docnos = complements.get(term)
+                if docnos is None:
+                    complements[term] = docnos = array("I")
+                docnos.append(docno)
+
+        if len(self._docs) >= self.COMMON_TERM_MIN_DOCS:
+            threshold = self.COMMON_TERM_RATIO * len(self._docs)
+            for term in terms:
+                if term not in self._common_terms and self._df[term] > threshold:
+                    self._make_common(term)
+
+    def _remove(self, doc_id: str) -> None:
+        # Postings are cleaned lazily by _purge(); queries skip dead doc numbers
+        docno = self._docs.pop(doc_id, None)
+        if docno is None:
+            return
+        base_score = self._base_scores[docno]
+        bucket = self._by_base_score[base_score]
+        bucket.discard(docno)
+        if not bucket:
+            del self._by_base_score[base_score]
+        self._base_scores[docno] = 0
+        self._ids[docno] = None
+        self._metadata[docno] = None
+        self._dead += 1
+
+    def _make_common(self, term: str) -> None:
+        self._common_terms.add(term)
+        for base_score, live in self._by_base_score.items():
+            docnos = self._postings.get(base_score, {}).pop(term, None)
+            having = set(docnos) if docnos else set()
+            lacking = array("I", (d for d in live if d not in having))
+            if lacking:
+                self._complements.setdefault(base_score, {})[term] = lacking
+
+    def _make_rare(self, term: str) -> None:
+        self._common_terms.discard(term)
+        for base_score, live in self._by_base_score.items():
+            docnos = self._complements.get(base_score, {}).pop(term, None)
+            lacking = set(docnos) if docnos else set()
+            having = array("I", sorted(d for d in live if d not in lacking))
+            if having:
+                self._postings.setdefault(base_score, {})[term] = having
+
+    def _purge(self) -> None:
+        """Drop deleted documents, renumber the live ones and recount term frequencies"""
+        # Live documents keep their relative order, so postings stay sorted
+        remap = [-1] * len(self._ids)
+        ids, metadata = [], []
+        base_scores, lengths, unique_terms = array("B"), array("I"), array("I")
+        for docno, base_score in enumerate(self._base_scores):
+            if not base_score:
+                continue
+            remap[docno] = len(ids)
+            ids.append(self._ids[docno])
+            metadata.append(self._metadata[docno])
+            base_scores.append(base_score)
+            lengths.append(self._lengths[docno])
+            unique_terms.append(self._unique_terms[docno])
+
+        df = Counter()
+        for lists, counts_present in ((self._postings, True), (self._complements, False)):
+            for terms in lists.values():
+                for term, docnos in list(terms.items()):
+                    kept = array("I", (remap[d] for d in docnos if remap[d] >= 0))
+                    if kept:
+                        terms[term] = kept
+                        df[term] += len(kept) if counts_present else -len(kept)
+                    else:
+                        del terms[term]
+
+        self._ids, self._metadata = ids, metadata
+        self._base_scores, self._lengths, self._unique_terms = base_scores, lengths, unique_terms
+        self._docs = {doc_id: docno for docno, doc_id in enumerate(ids)}
+        self._by_base_score = {
+            base_score: {remap[d] for d in docnos} for base_score, docnos in self._by_base_score.items()
+        }
+        for term in self._common_terms:
+            df[term] += len(self._docs)
+        self._df = {term: count for term, count in df.items() if count > 0}
+        self._dead = 0
+
+        total = len(self._docs)
+        for term in list(self._common_terms):
+            if self._df.get(term, 0) < self.RARE_TERM_RATIO * total:
+                self._make_rare(term)
+        if total >= self.COMMON_TERM_MIN_DOCS:
+            for term, count in self._df.items():
+                if term not in self._common_terms and count > self.COMMON_TERM_RATIO * total:
+                    self._make_common(term)
+
+    def _append(self, record: dict) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        self._journal_records += 1
+        if self._journal_records > max(self.COMPACT_MIN_RECORDS, 2 * len(self._docs)):
+            self.compact()
+
+    @staticmethod
+    def _parse_record(line: str) -> Optional[dict]:
+        """Decode a journal line, or None if it is corrupt or malformed"""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            record = json.loads(line)
+            if not isinstance(record.get("id"), str):
+                return None
+            if record.get("op") == "delete":
+                return record
+            if record.get("op") != "add":
+                return None
+            # Older journals stored term frequencies; only the terms matter
+            record["terms"] = [str(term) for term in record["terms"]]
+            record["length"] = int(record["length"])
+            record["base_score"] = int(record["base_score"])
+            if not 0 < record["base_score"] <= 100 or not isinstance(record.get("metadata", {}), dict):
+                return None
+            return record
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _replay_journal(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                self._journal_records += 1
+                record = self._parse_record(line)
+                if record is None:
+                    # A crash mid-append can leave a truncated last line
+                    print("⚠️  Skipping corrupt corpus index record")
+                    continue
+                self._apply(record)
+
+
+def _default_index_path() -> str:
+    try:
+        from backend.config import settings
+        return settings.CORPUS_INDEX_PATH
+    except Exception:
+        return "data/resume_index.jsonl"
+
+
+corpus_index = CorpusIndex(_default_index_path())
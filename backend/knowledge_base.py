@@ -11,6 +11,18 @@ SKILLS_DB = {
     "marketing": "SEO, SEM, Google Analytics, Content Marketing, Social Media, Email Marketing, A/B Testing, CRM, Marketing Automation"
 }
 
+ROLE_ALIASES = {
+    "software": ["software engineer", "software developer", "full stack developer", "programmer", "python developer", "java developer"],
+    "data": ["data scientist", "data analyst", "data engineer", "machine learning engineer", "ml engineer", "business intelligence analyst"],
+    "devops": ["devops engineer", "site reliability engineer", "sre", "cloud engineer", "platform engineer", "infrastructure engineer"],
+    "llmops": ["llmops engineer", "mlops engineer", "ai engineer", "llm engineer", "generative ai engineer", "prompt engineer"],
+    "frontend": ["frontend developer", "front end engineer", "react developer", "ui developer", "web developer", "angular developer"],
+    "backend": ["backend developer", "back end engineer", "api developer", "node.js developer", "django developer", "server side developer"],
+    "mobile": ["mobile developer", "android developer", "ios developer", "flutter developer", "react native developer", "app developer"],
+    "finance": ["financial analyst", "finance manager", "accountant", "investment analyst", "risk analyst", "portfolio manager"],
+    "marketing": ["marketing manager", "digital marketer", "seo specialist", "content marketer", "growth marketer", "social media manager"]
+}
+
 ATS_KEYWORDS = """
 Leadership: Led, Managed, Directed, Coordinated, Supervised, Mentored, Guided
 Achievement: Achieved, Delivered, Exceeded, Improved, Increased, Reduced, Optimized, Streamlined
@@ -1,7 +1,12 @@
+import hashlib
+import json
 import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Union
-from pydantic import BaseModel, field_validator, ConfigDict
+from pydantic import BaseModel, field_validator, ConfigDict, ValidationError
 
 # LangChain imports
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -118,8 +123,23 @@ class ResumeData(BaseModel):
         return v
 
 
+_llm = None
+_llm_lock = threading.Lock()
+
+
 def get_llm():
     """Get LangChain ChatGoogleGenerativeAI instance with multiple fallback models"""
+    global _llm
+    # The client is probed once and then reused, so calls don't pay for a test query
+    if _llm is not None:
+        return _llm
+    with _llm_lock:
+        if _llm is None:
+            _llm = _create_llm()
+    return _llm
+
+
+def _create_llm():
     try:
         from backend.config import settings
         api_key = settings.GOOGLE_API_KEY or os.getenv("GOOGLE_API_KEY")  
@@ -194,6 +214,19 @@ def extract_text_from_response(response: Union[AIMessage, str]) -> str:
 
 
 def get_skill_suggestions(query: str) -> dict:
+    """Get skill suggestions locally, falling back to the LLM when unsure"""
+    from backend.skill_suggester import skill_suggester
+    local = skill_suggester.suggest(query)
+    if local:
+        return local
+    
+    result = get_llm_skill_suggestions(query)
+    if result["skills"]:
+        skill_suggester.learn(query, result["skills"])
+    return result
+
+
+def get_llm_skill_suggestions(query: str) -> dict:
     """Get accurate skill suggestions from LLM using LangChain"""
     llm = get_llm()
     if not llm:
@@ -234,15 +267,16 @@ Problem Solving"""
         
         skills_text = skills_text.strip()
         
-        # Parse skills into a list (one per line)
-        skills_list = [skill.strip() for skill in skills_text.split('\n') if skill.strip()]
-        # Remove any bullet points or numbering
-        skills_list = [re.sub(r'^[\d\.\-\*\•]+\s*', '', skill) for skill in skills_list]
+        # Parse skills into a list (one per line), dropping bullets, numbering
+        # and preamble lines like "Here are the skills:"
+        from backend.skill_suggester import clean_skill_names
+        skills_list = clean_skill_names(skills_text.split('\n'))
         
         return {
             "skills": skills_list,
             "text": skills_text,
-            "formatted": ", ".join(skills_list)
+            "formatted": ", ".join(skills_list),
+            "source": "llm"
         }
     except Exception as e:
         error_msg = str(e)
@@ -250,68 +284,190 @@ Problem Solving"""
         return {"skills": [], "text": f"Error: {error_msg}", "formatted": ""}
 
 
-def generate_resume(data: ResumeData, jd: Optional[str] = None) -> str:
-    """Generate resume text from data using LangChain + Gemini with RAG"""
-    llm = get_llm()
+RESUME_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "objective", "career objective", "about me"),
+    "skills": ("skills", "technical skills", "key skills", "core competencies", "competencies"),
+    "experience": ("experience", "work experience", "professional experience", "employment history", "work history", "employment"),
+    "education": ("education", "academic background", "qualifications", "education and training"),
+}
+
+
+def parse_resume_text(text: str) -> dict:
+    """Split a pasted resume into name, contact details and sections ("" when not found)"""
+    parsed = {field: "" for field in ("name", "email", "phone", "summary", "skills", "experience", "education")}
     
-    rag_context = ""
-    if jd:
-        try:
-            from backend.rag import rag_service
-            relevant_skills = rag_service.get_relevant_skills(jd)
-            if relevant_skills:
-                rag_context = f"\n\nRelevant Skills/Keywords to emphasize:\n{relevant_skills}"
-        except Exception as e:
-            print(f"⚠️  RAG service error: {e}")
-            pass
+    email_match = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)
+    if email_match:
+        parsed["email"] = email_match.group(0)
+    for phone_match in re.finditer(r'\+?\(?\d[\d\s().-]{8,}\d', text):
+        digits = re.sub(r'\D', '', phone_match.group(0))
+        # Keep the local number of "+91 98765 43210"-style phones
+        if 10 <= len(digits) <= 13:
+            parsed["phone"] = digits[-10:]
+            break
     
-    if llm and jd:
-        prompt = f"""Create an ATS-friendly resume optimized for this job:
+    heading_to_section = {
+        heading: section for section, headings in RESUME_HEADINGS.items() for heading in headings
+    }
+    current = None
+    header_lines, section_lines = [], {section: [] for section in RESUME_HEADINGS}
+    for line in text.splitlines():
+        key = re.sub(r'[^a-z ]', '', line.lower()).strip()
+        if key in heading_to_section:
+            current = heading_to_section[key]
+        elif current:
+            section_lines[current].append(line)
+        else:
+            header_lines.append(line)
+    
+    for section, lines in section_lines.items():
+        parsed[section] = "\n".join(lines).strip()
+    name_lines = [line.strip() for line in header_lines if line.strip()]
+    if name_lines:
+        parsed["name"] = name_lines[0]
+    return parsed
+
+
+def resume_data_from_text(text: str, fallbacks: dict) -> ResumeData:
+    """Build ResumeData from a pasted resume.
+
+    Fields that are missing or fail validation (a one-line skills section, a
+    name with a job title) take their value from `fallbacks` instead.
+    """
+    parsed = parse_resume_text(text)
+    values = {field: parsed[field] or fallback for field, fallback in fallbacks.items()}
+    try:
+        return ResumeData(**values)
+    except ValidationError as e:
+        failed = {error["loc"][0] for error in e.errors() if error["loc"]}
+        if all(values[field] == fallbacks[field] for field in failed):
+            raise
+        values.update({field: fallbacks[field] for field in failed})
+        return ResumeData(**values)
+
+
+RESUME_SECTIONS = {
+    # section -> (heading, ResumeData fields it rewrites, fields it reads as context)
+    "header": ("", ("name", "phone", "email"), ()),
+    "summary": ("PROFESSIONAL SUMMARY", ("summary",), ("skills", "experience")),
+    "skills": ("SKILLS", ("skills",), ()),
+    "experience": ("EXPERIENCE", ("experience",), ()),
+    "education": ("EDUCATION", ("education",), ()),
+}
+
+SECTION_CACHE_MAX = 2048
+_section_cache: "OrderedDict[str, str]" = OrderedDict()
+_section_cache_lock = threading.Lock()
+
+
+def section_cache_key(section: str, data: ResumeData, jd: Optional[str]) -> str:
+    """Cache key of a section: every field its prompt contains plus the JD hash"""
+    jd_hash = hashlib.sha256((jd or "").encode("utf-8")).hexdigest()
+    _, fields, context = RESUME_SECTIONS[section]
+    payload = json.dumps([section, jd_hash] + [getattr(data, field) for field in fields + context])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _template_section(section: str, data: ResumeData) -> str:
+    if section == "header":
+        return f"{data.name}\n\n\nPhone: {data.phone}\nEmail: {data.email}"
+    return getattr(data, section)
+
+
+def _generate_section(llm, section: str, data: ResumeData, jd: str, rag_context: str) -> Optional[str]:
+    """Rewrite one resume section for the JD, or None on failure"""
+    heading, fields, context = RESUME_SECTIONS[section]
+    section_info = "\n".join(f"{field.title()}: {getattr(data, field)}" for field in fields)
+    # Only the declared context fields are shown, and they are part of the
+    # cache key, so a cached section never reflects stale or foreign data
+    context_info = ""
+    if context:
+        context_info = "\n\nCandidate's resume (context only, do not repeat it in this section):\n" + "\n".join(
+            f"{field.title()}: {getattr(data, field)}" for field in context
+        )
+    prompt = f"""Rewrite the {heading.title()} section of an ATS-friendly resume optimized for this job:
 
 Job Description: {jd}{rag_context}
 
-Candidate Info:
-Name: {data.name}
-Email: {data.email}
-Phone: {data.phone}
-Summary: {data.summary}
-Skills: {data.skills}
-Experience: {data.experience}
-Education: {data.education}
+Section to rewrite:
+{section_info}{context_info}
 
-Format professionally with clear sections. Keep contact info on separate lines. Output only the resume content."""
-        
-        try:
-            # LangChain invoke method
-            response = llm.invoke([HumanMessage(content=prompt)])
-            
-            # Safely extract text
-            resume_text = extract_text_from_response(response)
-            
-            if resume_text:
-                return resume_text
-            else:
-                print("⚠️  Empty response from LLM, using template")
-                
-        except Exception as e:
-            print(f"❌ LLM generation failed: {e}")
+Output only the section content, without the section heading."""
     
-    # Template fallback - contact info on separate lines
-    return f"""{data.name}
+    try:
+        response = llm.invoke([HumanMessage(content=prompt)])
+        section_text = extract_text_from_response(response).strip()
+        if section_text:
+            return section_text
+        print(f"⚠️  Empty response for {section} section, using template")
+    except Exception as e:
+        print(f"❌ LLM generation failed for {section} section: {e}")
+    return None
 
 
-Phone: {data.phone}
-Email: {data.email}
+def generate_resume_sections(data: ResumeData, jd: Optional[str] = None) -> dict:
+    """Generate each resume section, regenerating only those whose inputs changed"""
+    sections = {}
+    dirty = {}
+    with _section_cache_lock:
+        for section in RESUME_SECTIONS:
+            if section == "header" or not jd:
+                sections[section] = _template_section(section, data)
+                continue
+            key = section_cache_key(section, data, jd)
+            if key in _section_cache:
+                _section_cache.move_to_end(key)
+                sections[section] = _section_cache[key]
+            else:
+                dirty[section] = key
+    
+    if not dirty:
+        return sections
+    
+    llm = get_llm()
+    if not llm:
+        for section in dirty:
+            sections[section] = _template_section(section, data)
+        return sections
+    
+    rag_context = ""
+    try:
+        from backend.rag import rag_service
+        relevant_skills = rag_service.get_relevant_skills(jd)
+        if relevant_skills:
+            rag_context = f"\n\nRelevant Skills/Keywords to emphasize:\n{relevant_skills}"
+    except Exception as e:
+        print(f"⚠️  RAG service error: {e}")
+    
+    # Dirty sections are independent prompts, so run them concurrently
+    with ThreadPoolExecutor(max_workers=len(dirty)) as executor:
+        futures = {
+            section: executor.submit(_generate_section, llm, section, data, jd, rag_context)
+            for section in dirty
+        }
+        results = {section: future.result() for section, future in futures.items()}
+    
+    with _section_cache_lock:
+        for section, section_text in results.items():
+            if section_text is None:
+                # Not cached, so the next edit retries the LLM
+                sections[section] = _template_section(section, data)
+                continue
+            sections[section] = section_text
+            _section_cache[dirty[section]] = section_text
+        while len(_section_cache) > SECTION_CACHE_MAX:
+            _section_cache.popitem(last=False)
+    return sections
 
-PROFESSIONAL SUMMARY
-{data.summary}
 
-SKILLS
-{data.skills}
+def assemble_resume(sections: dict) -> str:
+    """Join generated sections into the final resume text"""
+    parts = []
+    for section, (heading, _, _) in RESUME_SECTIONS.items():
+        parts.append(f"{heading}\n{sections[section]}" if heading else sections[section])
+    return "\n\n".join(parts) + "\n"
 
-EXPERIENCE
-{data.experience}
 
-EDUCATION
-{data.education}
-"""
\ No newline at end of file
+def generate_resume(data: ResumeData, jd: Optional[str] = None) -> str:
+    """Generate resume text from data using LangChain + Gemini with RAG"""
+    return assemble_resume(generate_resume_sections(data, jd))
@@ -1,6 +1,18 @@
-from typing import List, Optional
+from typing import List, Optional, Set
 from backend.knowledge_base import get_knowledge_text, SKILLS_DB, ATS_KEYWORDS
 
+ATS_ACTION_VERBS = ["led", "managed", "developed", "implemented", "achieved", "improved", "designed"]
+
+
+def ats_terms(text: str) -> List[str]:
+    """Split text into the tokens the ATS scorer compares"""
+    return text.lower().split()
+
+
+def ats_tokenize(text: str) -> Set[str]:
+    """Tokenize text the way the ATS scorer compares resumes and JDs"""
+    return set(ats_terms(text))
+
 class RAGService:
     def __init__(self):
         self.knowledge = get_knowledge_text()
@@ -49,13 +61,12 @@ class RAGService:
         
         return suggestions if suggestions else ["Resume looks ATS-friendly!"]
     
-    def calculate_ats_score(self, resume_text: str, jd: Optional[str] = None) -> int:
-        """Calculate ATS compatibility score (0-100)"""
+    def calculate_base_score(self, resume_text: str) -> int:
+        """JD-independent part of the ATS score (0-90)"""
         score = 50
         resume_lower = resume_text.lower()
         
-        action_verbs = ["led", "managed", "developed", "implemented", "achieved", "improved", "designed"]
-        score += min(15, sum(3 for verb in action_verbs if verb in resume_lower))
+        score += min(15, sum(3 for verb in ATS_ACTION_VERBS if verb in resume_lower))
         
         if any(char.isdigit() for char in resume_text):
             score += 15
@@ -63,11 +74,21 @@ class RAGService:
         if 300 < len(resume_text) < 2000:
             score += 10
         
+        return score
+    
+    def calculate_match_bonus(self, matched_terms: int, jd_terms: int) -> int:
+        """JD keyword-match part of the ATS score (0-10)"""
+        match_ratio = matched_terms / jd_terms if jd_terms else 0
+        return int(match_ratio * 10)
+    
+    def calculate_ats_score(self, resume_text: str, jd: Optional[str] = None) -> int:
+        """Calculate ATS compatibility score (0-100)"""
+        score = self.calculate_base_score(resume_text)
+        
         if jd:
-            jd_words = set(jd.lower().split())
-            resume_words = set(resume_lower.split())
-            match_ratio = len(jd_words & resume_words) / len(jd_words) if jd_words else 0
-            score += int(match_ratio * 10)
+            jd_words = ats_tokenize(jd)
+            resume_words = ats_tokenize(resume_text)
+            score += self.calculate_match_bonus(len(jd_words & resume_words), len(jd_words))
         
         return min(100, score)
 
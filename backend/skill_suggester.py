@@ -0,0 +1,289 @@
+import json
+import os
+import re
+import threading
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, Optional, Set
+
+from backend.knowledge_base import ROLE_ALIASES, SKILLS_DB
+
+# Words shared by many role names; a fuzzy match must also agree on the
+# remaining words, or "civil engineer" would pair with "ml engineer"
+GENERIC_ROLE_WORDS = {
+    "engineer", "engineers", "developer", "developers", "dev", "analyst", "manager",
+    "specialist", "consultant", "architect", "administrator", "expert", "professional",
+    "senior", "sr", "junior", "jr", "lead", "principal", "staff", "associate", "intern",
+    "entry", "level", "role", "job", "position", "skills", "skill",
+    "a", "an", "the", "and", "or", "for", "with", "in", "of", "as",
+}
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9+#./ ]", " ", text.lower()).split())
+
+
+def _role_key(normalized: str) -> str:
+    """The role-distinguishing words of a normalized role name or query"""
+    return " ".join(word for word in normalized.split() if word not in GENERIC_ROLE_WORDS)
+
+
+def _ngrams(text: str, n: int) -> Set[str]:
+    padded = f" {text} "
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+def _dice(a: Set[str], b: Set[str]) -> float:
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+
+def _split_skills(skills: str) -> List[str]:
+    return [skill.strip() for skill in skills.split(",") if skill.strip()]
+
+
+# Chatty LLM lines such as "Here are the top skills:" that are not skills
+PREAMBLE_PATTERN = re.compile(r"^(here (are|is)|sure|certainly|of course|below|these are|note)\b", re.IGNORECASE)
+MAX_SKILL_WORDS = 5
+
+
+def clean_skill_names(lines: List[str]) -> List[str]:
+    """Keep only lines that look like skill names, without bullets or numbering"""
+    skills = []
+    for line in lines:
+        skill = re.sub(r'^[\d\.\-\*\•]+\s*', '', str(line).strip()).strip()
+        if not skill or skill.endswith(":") or PREAMBLE_PATTERN.match(skill):
+            continue
+        if len(skill.split()) > MAX_SKILL_WORDS:
+            continue
+        if skill not in skills:
+            skills.append(skill)
+    return skills
+
+
+class SkillSuggester:
+    """Local skill suggestions from the knowledge base, without an LLM call.
+
+    Role names are matched fuzzily through a character n-gram index over the
+    full name; a candidate only counts if its distinguishing words (generic
+    ones like "engineer" removed) are also similar. Suggested skills are
+    expanded with a skill co-occurrence matrix. Answers from the LLM fallback
+    are learned as new roles under the full query and appended to a JSONL
+    journal, so the local model grows with use.
+    """
+
+    NGRAM = 3
+    MIN_CONFIDENCE = 0.7
+    MIN_KEY_SIMILARITY = 0.5
+    MAX_CACHE = 1024
+    MAX_SUGGESTIONS = 50
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.RLock()
+        self._loaded = False
+        # normalized role name -> skill list, in preference order
+        self._roles: Dict[str, List[str]] = {}
+        # n-gram -> role names containing it
+        self._ngram_index: Dict[str, Set[str]] = {}
+        self._role_ngrams: Dict[str, Set[str]] = {}
+        # n-grams of each role's distinguishing words
+        self._key_ngrams: Dict[str, Set[str]] = {}
+        # skill -> co-occurring skill -> count (lowercase keys)
+        self._cooccurrence: Dict[str, Counter] = {}
+        # lowercase skill -> display name
+        self._skill_names: Dict[str, str] = {}
+        # normalized query -> (confidence, ranked skills), or None if not confident
+        self._cache: Dict[str, Optional[tuple]] = {}
+        self._queries = 0
+        self._local_hits = 0
+
+    def initialize(self) -> bool:
+        """Build the model from the knowledge base and learned roles once"""
+        if self._loaded:
+            return True
+        with self._lock:
+            if self._loaded:
+                return True
+            for domain, skills in SKILLS_DB.items():
+                skill_list = _split_skills(skills)
+                for role in [domain] + ROLE_ALIASES.get(domain, []):
+                    self._add_role(role, skill_list)
+                self._add_cooccurrence(skill_list)
+            if self.path and os.path.exists(self.path):
+                try:
+                    self._replay_journal()
+                except Exception as e:
+                    print(f"⚠️  Skill model load failed: {e}")
+            self._loaded = True
+        return True
+
+    def suggest(self, query: str, k: int = 10) -> Optional[dict]:
+        """Suggest skills for a query, or None when confidence is low"""
+        self.initialize()
+        normalized = _normalize(query)
+        with self._lock:
+            self._queries += 1
+            if normalized in self._cache:
+                ranked = self._cache[normalized]
+            else:
+                ranked = self._rank(normalized)
+                if len(self._cache) >= self.MAX_CACHE:
+                    self._cache.clear()
+                self._cache[normalized] = ranked
+            if ranked is None:
+                return None
+            self._local_hits += 1
+
+        confidence, skills = ranked
+        skills = skills[:k]
+        return {
+            "skills": skills,
+            "text": "\n".join(skills),
+            "formatted": ", ".join(skills),
+            "source": "local",
+            "confidence": confidence,
+        }
+
+    def learn(self, query: str, skills: List[str]) -> None:
+        """Add an LLM answer to the local model"""
+        self.initialize()
+        record = self._parse_record({"query": _normalize(query), "skills": clean_skill_names(skills)})
+        if record is None:
+            return
+        with self._lock:
+            self._apply(record)
+            self._append(record)
+
+    def stats(self) -> dict:
+        """How many queries were answered locally"""
+        with self._lock:
+            return {
+                "queries": self._queries,
+                "local": self._local_hits,
+                "llm": self._queries - self._local_hits,
+                "local_ratio": self._local_hits / self._queries if self._queries else 0.0,
+            }
+
+    def _rank(self, normalized: str) -> Optional[tuple]:
+        """Confidence and the full ranked skill list for a query"""
+        role, confidence = self._match_role(normalized)
+        if not role or confidence < self.MIN_CONFIDENCE:
+            return None
+
+        # Skills named in the query lead, then the role's own skills
+        query_words = set(normalized.split())
+        role_skills = self._roles[role]
+        skills = [s for s in role_skills if s.lower() in query_words]
+        skills += [s for s in role_skills if s not in skills]
+
+        related = Counter()
+        for skill in skills:
+            related.update(self._cooccurrence.get(skill.lower(), {}))
+        seen = {s.lower() for s in skills}
+        for skill, _ in related.most_common():
+            if len(skills) >= self.MAX_SUGGESTIONS:
+                break
+            if skill not in seen:
+                skills.append(self._skill_names[skill])
+                seen.add(skill)
+
+        return round(confidence, 2), skills[:self.MAX_SUGGESTIONS]
+
+    def _match_role(self, normalized: str):
+        key = _role_key(normalized)
+        if not key:
+            return None, 0.0
+        if normalized in self._roles:
+            return normalized, 1.0
+        query_grams = _ngrams(normalized, self.NGRAM)
+        key_grams = _ngrams(key, self.NGRAM)
+        shared = Counter(chain.from_iterable(
+            self._ngram_index[gram] for gram in query_grams if gram in self._ngram_index
+        ))
+        best_role, best_score = None, 0.0
+        for role, count in shared.items():
+            # Dice coefficient over character n-grams of the full names
+            score = 2 * count / (len(query_grams) + len(self._role_ngrams[role]))
+            if score <= best_score:
+                continue
+            # "sales engineer" and "sales manager" share "sales", but the full
+            # names differ; "hardware" and "software engineer" fail this check
+            if _dice(key_grams, self._key_ngrams[role]) < self.MIN_KEY_SIMILARITY:
+                continue
+            best_role, best_score = role, score
+        return best_role, best_score
+
+    def _add_role(self, role: str, skills: List[str]) -> None:
+        role = _normalize(role)
+        if not _role_key(role):
+            return
+        if role not in self._role_ngrams:
+            grams = _ngrams(role, self.NGRAM)
+            self._role_ngrams[role] = grams
+            self._key_ngrams[role] = _ngrams(_role_key(role), self.NGRAM)
+            for gram in grams:
+                self._ngram_index.setdefault(gram, set()).add(role)
+        self._roles[role] = list(skills)
+        for skill in skills:
+            self._skill_names.setdefault(skill.lower(), skill)
+
+    def _add_cooccurrence(self, skills: List[str]) -> None:
+        keys = [skill.lower() for skill in skills]
+        for key in keys:
+            counts = self._cooccurrence.setdefault(key, Counter())
+            counts.update(other for other in keys if other != key)
+
+    def _apply(self, record: dict) -> None:
+        self._add_role(record["query"], record["skills"])
+        self._add_cooccurrence(record["skills"])
+        self._cache.clear()
+
+    def _append(self, record: dict) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    @staticmethod
+    def _parse_record(record) -> Optional[dict]:
+        """Validate a learned role, or None if it is malformed"""
+        if not isinstance(record, dict):
+            return None
+        query, skills = record.get("query"), record.get("skills")
+        if not isinstance(query, str) or not _role_key(_normalize(query)):
+            return None
+        if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+            return None
+        skills = [skill.strip() for skill in skills if skill.strip()]
+        if not skills:
+            return None
+        return {"query": _normalize(query), "skills": skills}
+
+    def _replay_journal(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = self._parse_record(json.loads(line))
+                except json.JSONDecodeError:
+                    record = None
+                if record is None:
+                    print("⚠️  Skipping corrupt skill model record")
+                    continue
+                self._apply(record)
+
+
+def _default_model_path() -> str:
+    try:
+        from backend.config import settings
+        return settings.SKILL_MODEL_PATH
+    except Exception:
+        return "data/skill_model.jsonl"
+
+
+skill_suggester = SkillSuggester(_default_model_path())
@@ -0,0 +1,117 @@
+"""Memory benchmark: PDF bytes in session state vs. the artifact store.
+
+Runs concurrent Streamlit-like sessions on threads. Each one generates a
+resume PDF, keeps it for email and renders a download button, then reruns
+without the button (another tab, a new form submit). The media file
+manager is modelled the way Streamlit's in-memory storage behaves: it keeps
+the object passed to `st.download_button` until the next rerun, keyed by
+content so identical files are shared.
+
+- session bytes: the PDF in session state, passed to the button as bytes,
+  so state and media manager share one object that outlives the button
+- artifact store: only the hash in session state; the button gets an open
+  file, so the media manager holds a copy read from disk until the rerun
+
+    python -m benchmarks.artifact_memory --sessions 500 --pdf-kb 60
+"""
+import argparse
+import hashlib
+import os
+import random
+import tempfile
+import threading
+import tracemalloc
+from typing import Dict, Tuple
+
+from backend.artifact_store import ArtifactStore
+
+
+def make_pdf(size: int, seed: int) -> bytes:
+    return random.Random(seed).getrandbits(size * 8).to_bytes(size, "little")
+
+
+class MediaFileManager:
+    """Content-keyed in-memory files, dropped when a session reruns"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files: Dict[str, bytes] = {}
+        self._sessions: Dict[int, set] = {}
+
+    def add(self, session: int, data: bytes) -> None:
+        file_id = hashlib.sha224(data).hexdigest()
+        with self._lock:
+            self._files.setdefault(file_id, data)
+            self._sessions.setdefault(session, set()).add(file_id)
+
+    def clear_session(self, session: int) -> None:
+        with self._lock:
+            self._sessions.pop(session, None)
+            live = set().union(*self._sessions.values())
+            for file_id in [f for f in self._files if f not in live]:
+                del self._files[file_id]
+
+
+def run_sessions(sessions: int, size: int, distinct: int, store: ArtifactStore = None) -> Tuple[int, int, int]:
+    """Resident bytes with the download shown, after a rerun, and the peak"""
+    media = MediaFileManager()
+    states = [{} for _ in range(sessions)]
+    shown = threading.Barrier(sessions + 1)
+    measured = threading.Barrier(sessions + 1)
+    rerun = threading.Barrier(sessions + 1)
+
+    def session(i: int) -> None:
+        pdf = make_pdf(size, i % distinct)
+        if store is None:
+            states[i]["resume_pdf"] = pdf
+            media.add(i, pdf)
+        else:
+            states[i]["resume_pdf_hash"] = store.put(pdf, ".pdf")
+            del pdf
+            with store.open(states[i]["resume_pdf_hash"]) as f:
+                # download_button(data=file) calls file.read() and keeps the result
+                media.add(i, f.read())
+        shown.wait()
+        measured.wait()
+        media.clear_session(i)
+        rerun.wait()
+
+    tracemalloc.start()
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    shown.wait()
+    with_download, _ = tracemalloc.get_traced_memory()
+    measured.wait()
+    rerun.wait()
+    after_rerun, peak = tracemalloc.get_traced_memory()
+    for thread in threads:
+        thread.join()
+    tracemalloc.stop()
+    return with_download, after_rerun, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--pdf-kb", type=int, default=60)
+    parser.add_argument("--distinct", type=int, default=0, help="distinct PDFs (default: one per session)")
+    args = parser.parse_args()
+
+    size = args.pdf_kb * 1024
+    distinct = args.distinct or args.sessions
+    mib = 1024 * 1024
+
+    shown, rerun, peak = run_sessions(args.sessions, size, distinct)
+    print(f"session bytes   download shown {shown / mib:8.1f} MiB   after rerun {rerun / mib:8.1f} MiB   peak {peak / mib:8.1f} MiB")
+
+    with tempfile.TemporaryDirectory() as root:
+        store = ArtifactStore(os.path.join(root, "artifacts"))
+        store.initialize()
+        shown, rerun, peak = run_sessions(args.sessions, size, distinct, store)
+        disk = store.total_bytes
+    print(f"artifact store  download shown {shown / mib:8.1f} MiB   after rerun {rerun / mib:8.1f} MiB   peak {peak / mib:8.1f} MiB   on disk {disk / mib:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import json
+import random
+
+from backend.corpus_index import CorpusIndex
+from backend.rag import rag_service
+
+VOCAB = ["the", "and", "to", "of", "led", "managed", "developed", "improved", "2021", "40%"] + [
+    f"term{i}" for i in range(500)
+]
+WEIGHTS = [1 / (i + 1) for i in range(len(VOCAB))]
+
+
+def make_text(rng, low=30, high=400):
+    return " ".join(rng.choices(VOCAB, WEIGHTS, k=rng.randint(low, high)))
+
+
+def small_index(path):
+    index = CorpusIndex(str(path))
+    # Low thresholds so common-term complements, purges and compaction all run
+    index.COMMON_TERM_MIN_DOCS = 50
+    index.PURGE_MIN_DEAD = 20
+    index.COMPACT_MIN_RECORDS = 100
+    return index
+
+
+def build_corpus(index, rng, size=600):
+    live = {}
+    for i in range(size):
+        doc_id = str(i)
+        live[doc_id] = make_text(rng)
+        index.add(live[doc_id], doc_id=doc_id)
+        if i % 4 == 0:
+            victim = str(rng.randrange(i + 1))
+            if live.pop(victim, None) is not None:
+                assert index.delete(victim)
+        if i % 7 == 0 and live:
+            doc_id = rng.choice(list(live))
+            live[doc_id] = make_text(rng)
+            index.add(live[doc_id], doc_id=doc_id)
+    return live
+
+
+def assert_matches_ats_score(index, live, rng, queries=10):
+    for _ in range(queries):
+        jd = make_text(rng, 0, 80)
+        for k in (1, 10, 50):
+            expected = sorted((rag_service.calculate_ats_score(text, jd) for text in live.values()), reverse=True)[:k]
+            results = index.top_k(jd, k)
+            assert [r["score"] for r in results] == expected
+            assert len({r["id"] for r in results}) == len(results)
+            for r in results:
+                assert rag_service.calculate_ats_score(live[r["id"]], jd) == r["score"]
+
+
+def test_top_k_agrees_with_ats_score(tmp_path):
+    rng = random.Random(7)
+    index = small_index(tmp_path / "index.jsonl")
+    live = build_corpus(index, rng)
+    assert index._common_terms
+    assert len(index) == len(live)
+    assert_matches_ats_score(index, live, rng)
+
+
+def test_reload_and_compaction_keep_results(tmp_path):
+    rng = random.Random(11)
+    path = tmp_path / "index.jsonl"
+    live = build_corpus(small_index(path), rng)
+
+    reloaded = small_index(path)
+    assert len(reloaded) == len(live)
+    assert_matches_ats_score(reloaded, live, rng, queries=3)
+
+    reloaded.compact()
+    with open(path, encoding="utf-8") as f:
+        assert sum(1 for _ in f) == len(live)
+    assert_matches_ats_score(small_index(path), live, rng, queries=3)
+
+
+def test_mass_delete_reclaims_slots(tmp_path):
+    rng = random.Random(3)
+    index = small_index(tmp_path / "index.jsonl")
+    live = build_corpus(index, rng)
+    for doc_id in rng.sample(list(live), len(live) * 3 // 4):
+        del live[doc_id]
+        index.delete(doc_id)
+    assert len(index._ids) <= len(live) + max(index.PURGE_MIN_DEAD, len(live)) + 1
+    assert_matches_ats_score(index, live, rng, queries=3)
+
+
+def test_re_adding_same_resume_does_not_grow_forever(tmp_path):
+    index = small_index(tmp_path / "index.jsonl")
+    text = "Led a team and improved latency by 40% " * 20
+    for _ in range(200):
+        index.add(text)
+    assert len(index) == 1
+    assert len(index._ids) <= index.PURGE_MIN_DEAD + 2
+    assert index.top_k("latency", 5)[0]["score"] == rag_service.calculate_ats_score(text, "latency")
+
+
+def test_malformed_records_are_skipped(tmp_path):
+    path = tmp_path / "index.jsonl"
+    index = small_index(path)
+    index.add("first resume led team 2020", doc_id="a")
+    index.add("second resume managed team 2021", doc_id="b")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "add", "id": "bad"}) + "\n")
+        f.write("{truncated\n")
+    small_index(path).add("third resume developed api 2022", doc_id="c")
+
+    reloaded = small_index(path)
+    assert all(doc_id in reloaded for doc_id in ("a", "b", "c"))
+    assert "bad" not in reloaded
+    assert len(reloaded) == 3
+
+
+def test_failed_load_never_compacts(tmp_path):
+    path = tmp_path / "index.jsonl"
+    index = small_index(path)
+    for i in range(10):
+        index.add(f"resume number {i} led team", doc_id=str(i))
+    size = path.stat().st_size
+
+    class FailingIndex(CorpusIndex):
+        def _replay_journal(self):
+            super()._replay_journal()
+            raise OSError("disk error")
+
+    broken = FailingIndex(str(path))
+    broken.initialize()
+    broken.compact()
+    assert path.stat().st_size == size
@@ -0,0 +1,41 @@
+import json
+
+from backend.skill_suggester import SkillSuggester, clean_skill_names
+
+
+def test_knowledge_base_roles_match_fuzzily():
+    suggester = SkillSuggester()
+    assert suggester.suggest("Senior DevOps Engineer")["skills"]
+    assert suggester.suggest("front-end developer")["skills"]
+    assert suggester.suggest("civil engineer") is None
+    assert suggester.suggest("hardware engineer") is None
+
+
+def test_learned_roles_are_not_served_for_other_roles(tmp_path):
+    suggester = SkillSuggester(str(tmp_path / "skills.jsonl"))
+    suggester.learn("Sales Manager", ["CRM", "Negotiation", "Forecasting"])
+
+    assert suggester.suggest("sales manager")["confidence"] == 1.0
+    assert suggester.suggest("sales engineer") is None
+    assert suggester.suggest("sales manager", k=2)["skills"] == ["CRM", "Negotiation"]
+
+
+def test_llm_preamble_is_not_learned(tmp_path):
+    suggester = SkillSuggester(str(tmp_path / "skills.jsonl"))
+    suggester.learn("Sales Manager", ["Here are the top skills:", "1. CRM", "- Negotiation"])
+    assert suggester.suggest("sales manager")["skills"][:2] == ["CRM", "Negotiation"]
+    assert clean_skill_names(["Sure! Below is a list of skills for you", "SQL", "SQL"]) == ["SQL"]
+
+
+def test_malformed_journal_records_are_skipped(tmp_path):
+    path = tmp_path / "skills.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"query": "sales manager"}) + "\n")
+        f.write(json.dumps({"query": "sales manager", "skills": "CRM"}) + "\n")
+        f.write("{truncated\n")
+        f.write(json.dumps({"skills": ["Go"]}) + "\n")
+        f.write(json.dumps({"query": "product manager", "skills": ["Roadmapping"]}) + "\n")
+
+    suggester = SkillSuggester(str(path))
+    assert suggester.suggest("sales manager") is None
+    assert suggester.suggest("product manager")["skills"][0] == "Roadmapping"